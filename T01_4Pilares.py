@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from abc import ABC, abstractmethod
+from typing import Protocol
 
 
 #Enums
@@ -27,7 +27,7 @@ class Plan:
     precio_mxn: float
     periodicidad: Periodicidad
 
-@dataclass
+@dataclass(slots=True)
 class Suscripcion:
     id: str
     usuario: Usuario
@@ -44,29 +44,27 @@ class Suscripcion:
             print("La suscripción ya está cancelada")
         self.activa = False
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Money:
     monto: float
     moneda: Moneda
 
     def convertir(self, moneda: Moneda) -> "Money":
-        if moneda == self.moneda:
+        if moneda is self.moneda:
             return self
         print("Conversión entre monedas invalida")
 
-#clase abstracta
-class MetodoPago(ABC):
-    def __init__(self, id: str, tipo: str):
-        self.id = id
-        self.tipo = tipo
+#Interfaz
+class MetodoPago(Protocol):
+    id: str
+    tipo: str
 
-    @abstractmethod
-    def pagar(self, monto: Money) -> bool:
-        pass
+    def pagar(self, monto: Money) -> bool: ...
 
-class Tarjeta(MetodoPago):
+class Tarjeta:
     def __init__(self, id: str, numero: str, titular: str, vencimiento: str):
-        super().__init__(id, "TARJETA")
+        self.id = id
+        self.tipo = "TARJETA"
         self.numero = numero
         self.titular = titular
         self.vencimiento = vencimiento
@@ -75,34 +73,37 @@ class Tarjeta(MetodoPago):
         print(f"Pagando con tarjeta {self.numero} a nombre de {self.titular}")
         return True
 
-class Transferencia(MetodoPago):
+class Transferencia:
     def __init__(self, id: str, clabe: str):
-        super().__init__(id, "TRANSFERENCIA")
+        self.id = id
+        self.tipo = "TRANSFERENCIA"
         self.clabe = clabe
 
     def pagar(self, monto: Money) -> bool:
         print(f"Pagando con transferencia a CLABE {self.clabe}")
         return True
 
-class Paypal(MetodoPago):
+class Paypal:
     def __init__(self, id: str, email: str):
-        super().__init__(id, "PAYPAL")
+        self.id = id
+        self.tipo = "PAYPAL"
         self.email = email
 
     def pagar(self, monto: Money) -> bool:
         print(f"Pagando con PayPal {self.email}")
         return True
 
-class ApplePay(MetodoPago):
+class ApplePay:
     def __init__(self, id: str, cuentaApple: str):
-        super().__init__(id, "APPLEPAY")
+        self.id = id
+        self.tipo = "APPLEPAY"
         self.cuentaApple = cuentaApple
 
     def pagar(self, monto: Money) -> bool:
         print(f"Pagando con ApplePay {self.cuentaApple}")
         return True
 
-@dataclass
+@dataclass(slots=True)
 class Factura:
     id: str
     suscripcion: Suscripcion
@@ -117,44 +118,65 @@ class Factura:
         else :
             print("Factura pagada correctamente")
 
-#Clase abstracta
-class PoliticaPrecio(ABC):
+#Interfaz
+class PoliticaPrecio(Protocol):
+    id: str
+    nombre: str
+
+    def aplicar(self, monto: Money) -> Money: ...
+
+    # (factor, offset) tal que precio = (monto + offset) * factor
+    def factor_and_offset(self, monto: Money) -> tuple[float, float]: ...
+
+def _precio_con_descuento(politica: PoliticaPrecio, monto: Money) -> float:
+    # única definición del descuento; la usan aplicar() y ServicioCobro
+    factor, offset = politica.factor_and_offset(monto)
+    return (monto.monto + offset) * factor
+
+class PrecioFull:
     def __init__(self, id: str, nombre: str):
         self.id = id
         self.nombre = nombre
 
-    @abstractmethod
     def aplicar(self, monto: Money) -> Money:
-        pass
+        return Money(_precio_con_descuento(self, monto), monto.moneda)
 
-class PrecioFull(PoliticaPrecio):
-    def aplicar(self, monto: Money) -> Money:
-        return monto
+    def factor_and_offset(self, monto: Money) -> tuple[float, float]:
+        return 1.0, 0.0
 
-class CuponPorcentaje(PoliticaPrecio):
+class CuponPorcentaje:
     def __init__(self, id: str, nombre: str, porcentaje: float):
-        super().__init__(id, nombre)
+        self.id = id
+        self.nombre = nombre
         self.porcentaje = porcentaje
 
     def aplicar(self, monto: Money) -> Money:
-        descuento = monto.monto * (self.porcentaje / 100)
-        return Money(monto.monto - descuento, monto.moneda)
+        return Money(_precio_con_descuento(self, monto), monto.moneda)
+
+    def factor_and_offset(self, monto: Money) -> tuple[float, float]:
+        return 1.0, -monto.monto * (self.porcentaje / 100)
 
-class CuponMonto(PoliticaPrecio):
+class CuponMonto:
     def __init__(self, id: str, nombre: str, descuento: float):
-        super().__init__(id, nombre)
+        self.id = id
+        self.nombre = nombre
         self.descuento = descuento
 
     def aplicar(self, monto: Money) -> Money:
-        return Money(max(monto.monto - self.descuento, 0), monto.moneda)
+        return Money(_precio_con_descuento(self, monto), monto.moneda)
 
-#Clase abstracta
-class CalculadoraImpuestos(ABC):
-    @abstractmethod
-    def aplicar(self, precio: Money) -> Money:
-        pass
+    def factor_and_offset(self, monto: Money) -> tuple[float, float]:
+        # el descuento nunca deja el precio por debajo de 0
+        return 1.0, -min(self.descuento, monto.monto)
+
+#Interfaz
+class CalculadoraImpuestos(Protocol):
+    def aplicar(self, precio: Money) -> Money: ...
 
-class ImpuestosMX(CalculadoraImpuestos):
+    # tasa combinada: precio con impuestos = monto + monto * tasa
+    def tasa_total(self) -> float: ...
+
+class ImpuestosMX:
     def __init__(self, tasaIVA: float = 0.16, tasaISR: float = 0.30):
         self.tasaIVA = tasaIVA
         self.tasaISR = tasaISR
@@ -163,24 +185,56 @@ class ImpuestosMX(CalculadoraImpuestos):
         impuestos = precio.monto * self.tasaIVA
         return Money(precio.monto + impuestos, precio.moneda)
 
-class ImpuestosUS(CalculadoraImpuestos):
+    def tasa_total(self) -> float:
+        return self.tasaIVA
+
+class ImpuestosUS:
+    _tasaFederal = 0.0
+    _tasaEstatal = 0.0
+
     def __init__(self, tasaFederal: float = 0.10, tasaEstatal: float = 0.08):
         self.tasaFederal = tasaFederal
         self.tasaEstatal = tasaEstatal
 
+    # la tasa combinada se recalcula al cambiar cualquiera de las dos
+    @property
+    def tasaFederal(self) -> float:
+        return self._tasaFederal
+
+    @tasaFederal.setter
+    def tasaFederal(self, tasa: float) -> None:
+        self._tasaFederal = tasa
+        self._recalcular()
+
+    @property
+    def tasaEstatal(self) -> float:
+        return self._tasaEstatal
+
+    @tasaEstatal.setter
+    def tasaEstatal(self, tasa: float) -> None:
+        self._tasaEstatal = tasa
+        self._recalcular()
+
+    def _recalcular(self) -> None:
+        self._tasa = self._tasaFederal + self._tasaEstatal
+
     def aplicar(self, precio: Money) -> Money:
-        impuestos = precio.monto * (self.tasaFederal + self.tasaEstatal)
+        impuestos = precio.monto * self._tasa
         return Money(precio.monto + impuestos, precio.moneda)
 
-@dataclass
+    def tasa_total(self) -> float:
+        return self._tasa
+
+@dataclass(slots=True)
 class ServicioCobro:
     politica: PoliticaPrecio
     calcImpuestos: CalculadoraImpuestos
 
     def calcularTotal(self, subtotal: Money) -> Money:
-        con_descuento = self.politica.aplicar(subtotal)
-        con_impuestos = self.calcImpuestos.aplicar(con_descuento)
-        return con_impuestos
+        # descuento e impuestos en una sola operación, sin Money intermedio
+        precio = _precio_con_descuento(self.politica, subtotal)
+        total = precio + precio * self.calcImpuestos.tasa_total()
+        return Money(total, subtotal.moneda)
 
 
 def probar_clases():
@@ -1,94 +1,198 @@
 from __future__ import annotations
-from abc import ABC, abstractmethod
+import json
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
-from statistics import mean
-from typing import Protocol, List
-from datetime import datetime
+from typing import Callable, Iterable, Iterator, Protocol, List
+from datetime import datetime, timedelta, timezone, tzinfo
+from time import time_ns
 
 class Notificador(Protocol):
     def enviar(self, mensaje: str) -> None: ...
+def _enviar_lote_de(n: Notificador) -> Callable[[list[str]], None]:
+    # enviar_lote() es opcional; sin él se envía un mensaje a la vez
+    enviar_lote = getattr(n, "enviar_lote", None)
+    if enviar_lote is not None:
+        return enviar_lote
+    enviar = n.enviar
+    def por_mensaje(mensajes: list[str]) -> None:
+        for m in mensajes:
+            enviar(m)
+    return por_mensaje
 class NotificadorEmail:
     def __init__(self, destinatario: str) -> None:
         self._destinatario = destinatario # encapsulado
     def enviar(self, mensaje: str) -> None:
         print(f"[EMAIL a {self._destinatario}] {mensaje}")
+    def enviar_lote(self, mensajes: list[str]) -> None:
+        # un solo correo resumen con todas las alertas
+        resumen = "\n".join(f"  - {m}" for m in mensajes)
+        print(f"[EMAIL a {self._destinatario}] {len(mensajes)} alerta(s):\n{resumen}")
 class NotificadorWebhook:
     def __init__(self, url: str) -> None:
         self._url = url
     def enviar(self, mensaje: str) -> None:
         print(f"[WEBHOOK {self._url}] {mensaje}")
-@dataclass
-class Sensor(ABC):
+    def enviar_lote(self, mensajes: list[str]) -> None:
+        # un solo POST con el arreglo JSON de mensajes
+        print(f"[WEBHOOK {self._url}] {json.dumps(mensajes, ensure_ascii=False)}")
+class SensorAlerta(Protocol):
+    # Lo que GestorAlertas y PanelEmergencias necesitan de un sensor concreto
+    id: str
+    @property
+    def promedio(self) -> float: ...
+    def _alerta_with_avg(self, avg: float) -> bool: ...
+@dataclass(slots=True)
+class Sensor:
     id: str
     ventana: int = 5
     _calibracion: float = field(default=0.0, repr=False) # encapsulado
-    _buffer: list[float] = field(default_factory=list, repr=False)
+    _buffer: deque[float] = field(init=False, repr=False)
+    _suma: float = field(init=False, default=0.0, repr=False) # suma acumulada de la ventana
+    _pendientes: int = field(init=False, default=0, repr=False) # lecturas hasta recalcular _suma
+
+    def __post_init__(self) -> None:
+        self._redimensionar()
+
+    def _redimensionar(self) -> deque[float]:
+        """Ajusta la ventana a self.ventana conservando las lecturas más recientes."""
+        if self.ventana < 1:
+            raise ValueError(f"ventana debe ser >= 1 (recibido {self.ventana})")
+        buffer = deque(getattr(self, "_buffer", ()), maxlen=self.ventana)
+        self._buffer = buffer
+        self._suma = sum(buffer)
+        self._pendientes = self.ventana
+        return buffer
 
     def leer(self, valor: float) -> None:
         """Agrega lectura aplicando calibración y mantiene ventana móvil."""
         v = valor + self._calibracion
-        self._buffer.append(v)
-        if len(self._buffer) > self.ventana:
-            self._buffer.pop(0)
+        buffer = self._buffer
+        ventana = self.ventana
+        if buffer.maxlen != ventana: # ventana cambió desde la última lectura
+            buffer = self._redimensionar()
+        if len(buffer) == ventana:
+            suma = self._suma + (v - buffer[0])
+        else:
+            suma = self._suma + v
+        buffer.append(v)
+        pendientes = self._pendientes - 1
+        # cada vuelta completa (o si salió un NaN/inf) se recalcula la suma para no arrastrar error
+        if not pendientes or suma != suma:
+            pendientes = ventana
+            suma = sum(buffer)
+        self._pendientes = pendientes
+        self._suma = suma
+
+    def leer_lote(self, valores: Iterable[float]) -> None:
+        """Agrega varias lecturas de una vez; equivale a llamar leer() por cada valor."""
+        buffer = self._buffer
+        if buffer.maxlen != self.ventana:
+            buffer = self._redimensionar()
+        agregar = buffer.append
+        calibracion = self._calibracion
+        ventana = self.ventana
+        suma = self._suma
+        pendientes = self._pendientes
+        for valor in valores:
+            v = valor + calibracion
+            if len(buffer) == ventana:
+                suma += v - buffer[0]
+            else:
+                suma += v
+            agregar(v)
+            pendientes -= 1
+            if not pendientes or suma != suma:
+                pendientes = ventana
+                suma = sum(buffer)
+        self._suma = suma
+        self._pendientes = pendientes
     @property
     def promedio(self) -> float:
-        return mean(self._buffer) if self._buffer else 0.0
-    @abstractmethod
-    def en_alerta(self) -> bool: ...
-@dataclass
+        """Promedio de la ventana a partir de la suma acumulada.
+
+        >>> s = SensorTemperatura(id="x", ventana=2)
+        >>> s.leer(1e308); s.leer(1e308); s.promedio
+        inf
+        >>> s.leer_lote([float("inf"), float("-inf")]); s.promedio
+        nan
+        >>> s = SensorTemperatura(id="x", ventana=10)
+        >>> s.leer_lote([float("nan")] + [1.0] * 10); s.promedio
+        1.0
+        >>> s = SensorTemperatura(id="x", ventana=5)
+        >>> s.leer(1e17)
+        >>> for _ in range(1000): s.leer(1.0)
+        >>> s.promedio
+        1.0
+        """
+        n = len(self._buffer)
+        return self._suma / n if n else 0.0
+    def en_alerta(self: SensorAlerta) -> bool:
+        # cada subclase define _alerta_with_avg; el tipo de self exige que exista
+        return self._alerta_with_avg(self.promedio)
+@dataclass(slots=True)
 class SensorTemperatura(Sensor):
     umbral: float = 80.0
-    def en_alerta(self) -> bool:
+    def _alerta_with_avg(self, avg: float) -> bool:
     # Polimorfismo: cada sensor define su propia condición
-        return self.promedio >= self.umbral
-@dataclass
+        return avg >= self.umbral
+@dataclass(slots=True)
 class SensorVibracion(Sensor):
     rms_umbral: float = 2.5
-    def en_alerta(self) -> bool:
+    def _alerta_with_avg(self, avg: float) -> bool:
     # Ejemplo tonto de RMS ~ promedio absoluto
-        return abs(self.promedio) >= self.rms_umbral
+        return abs(avg) >= self.rms_umbral
 class GestorAlertas:
-    def __init__(self, sensores: List[Sensor], notificadores: List[Notificador]) -> None:
+    def __init__(self, sensores: List[SensorAlerta], notificadores: List[Notificador]) -> None:
         self._sensores = sensores
-        self._notificadores = notificadores
+        # los notificadores se fijan al construir; agregarlos después a la lista no tiene efecto
+        self._senders = tuple(_enviar_lote_de(n) for n in notificadores)
     def evaluar_y_notificar(self) -> None:
+        msgs: list[str] = []
         for s in self._sensores:
-            if s.en_alerta():
-                msg = f"ALERTA: Sensor {s.id} en umbral (avg={s.promedio:.2f})"
-                for n in self._notificadores:
-                    n.enviar(msg)
+            avg = s.promedio
+            if s._alerta_with_avg(avg):
+                msgs.append(f"ALERTA: Sensor {s.id} en umbral (avg={avg:.2f})")
+        if not msgs:
+            return
+        # un solo envío por notificador con todas las alertas del ciclo
+        for send in self._senders:
+            send(msgs)
 
 #  nuevos elementos orientados al monitoreo de desastres 
 
-@dataclass
+@dataclass(slots=True)
 class SensorSismo(Sensor):
     magnitud_umbral: float = 5.0
 
-    def en_alerta(self) -> bool:
-        return self.promedio >= self.magnitud_umbral
+    def _alerta_with_avg(self, avg: float) -> bool:
+        return avg >= self.magnitud_umbral
 
-@dataclass
+@dataclass(slots=True)
 class SensorVolcan(Sensor):
     temperatura_umbral: float = 900.0 
     gas_umbral: float = 50.0 
 
-    def en_alerta(self) -> bool:
+    def _alerta_with_avg(self, avg: float) -> bool:
         # alerta si promedio supera cualquiera de los umbrales
-        return self.promedio >= self.temperatura_umbral or self.promedio >= self.gas_umbral
+        return avg >= self.temperatura_umbral or avg >= self.gas_umbral
 
 # Panel de monitoreo para desastres
-@dataclass
+@dataclass(slots=True)
 class PanelEmergencias:
     gestor: GestorAlertas 
     notificador: Notificador  
-    indicadores: list[Sensor] = field(default_factory=list)
+    indicadores: list[SensorAlerta] = field(default_factory=list)
 
     def actualizar_panel(self) -> None:
+        enviar = self.notificador.enviar
         for s in self.indicadores:
-            estado = "ALERTA" if s.en_alerta() else "NORMAL"
-            print(f"[PANEL] Sensor {s.id}: {estado} (avg={s.promedio:.2f})")
-            if s.en_alerta():
-                self.notificador.enviar(f"ALERTA: {s.id} en estado {estado}")
+            avg = s.promedio
+            alerta = s._alerta_with_avg(avg)
+            estado = "ALERTA" if alerta else "NORMAL"
+            print(f"[PANEL] Sensor {s.id}: {estado} (avg={avg:.2f})")
+            if alerta:
+                enviar(f"ALERTA: {s.id} en estado {estado}")
 
 class NotificadorSMS:
     def __init__(self, telefono: str) -> None:
@@ -98,18 +202,64 @@ class NotificadorSMS:
         print(f"[SMS a {self._telefono}] {mensaje}")
 
 
-@dataclass
+@dataclass(slots=True)
 class RegistroEvento:
     sensor: Sensor  
     mensaje: str
     timestamp: datetime = field(default_factory=datetime.now)
 
-@dataclass
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSEGUNDO = timedelta(microseconds=1)
+
 class HistorialEventos:
-    registros: list[RegistroEvento] = field(default_factory=list) 
+    # columnas paralelas; los RegistroEvento se construyen solo al leer
+    __slots__ = ("sensores", "mensajes", "timestamps", "zonas")
+
+    def __init__(self, registros: Iterable[RegistroEvento] = ()) -> None:
+        self.sensores: list[Sensor] = []
+        self.mensajes: list[str] = []
+        self.timestamps = array("q") # ns desde epoch (UTC)
+        self.zonas: list[tzinfo | None] = [] # tzinfo original; None = hora local sin zona
+        for r in registros:
+            ts = r.timestamp
+            self.sensores.append(r.sensor)
+            self.mensajes.append(r.mensaje)
+            self.timestamps.append((ts.astimezone(timezone.utc) - _EPOCH) // _MICROSEGUNDO * 1000)
+            self.zonas.append(ts.tzinfo)
+
+    def __repr__(self) -> str:
+        return f"HistorialEventos(eventos={len(self)})"
+
+    def __eq__(self, otro: object) -> bool:
+        if not isinstance(otro, HistorialEventos):
+            return NotImplemented
+        return (self.sensores, self.mensajes, self.timestamps, self.zonas) == \
+            (otro.sensores, otro.mensajes, otro.timestamps, otro.zonas)
 
     def agregar_evento(self, sensor: Sensor, mensaje: str) -> None:
-        self.registros.append(RegistroEvento(sensor=sensor, mensaje=mensaje))
+        self.sensores.append(sensor)
+        self.mensajes.append(mensaje)
+        self.timestamps.append(time_ns() // 1000 * 1000) # resolución de datetime (µs)
+        self.zonas.append(None) # hora local, como datetime.now()
+
+    def __len__(self) -> int:
+        return len(self.mensajes)
+
+    def __iter__(self) -> Iterator[RegistroEvento]:
+        for sensor, mensaje, ns, zona in zip(self.sensores, self.mensajes, self.timestamps, self.zonas):
+            utc = _EPOCH + timedelta(microseconds=ns // 1000)
+            if zona is None:
+                timestamp = utc.astimezone().replace(tzinfo=None)
+            else:
+                timestamp = utc.astimezone(zona)
+            yield RegistroEvento(sensor=sensor, mensaje=mensaje, timestamp=timestamp)
+
+    @property
+    def registros(self) -> tuple[RegistroEvento, ...]:
+        # copia de solo lectura que reconstruye todos los eventos en cada acceso (O(n));
+        # para recorrer usar `for r in historial` o guardar el resultado en una variable.
+        # Para agregar eventos usar agregar_evento().
+        return tuple(self)
 
 
 